@@ -1,20 +1,41 @@
-#!/usr/bin/env python3
+#!/usr/bin/env -S python3 -S -OO
 """
 Claude Code Productivity Statusline
 Displays code metrics, performance stats, and development context
 Replaces weather data with actual coding productivity indicators
+
+Note: the shebang runs python with -S (skip site.py) and -OO (drop
+asserts/docstrings) to trim interpreter startup; the script is stdlib-
+only, and the optional orjson import degrades gracefully when
+site-packages is not on the path. env -S needs coreutils >= 8.30 - use
+a plain `python3 statusline-hz.py` invocation on older systems.
+
+Note: normal runs exit via os._exit(0) after printing, skipping
+interpreter teardown (GC, atexit, logging shutdown) to shave a few ms
+off every prompt refresh. Set STATUSLINE_DEBUG=1 for a regular exit.
 """
 
 import os
 import sys
 import json
 import time
-import fcntl
-import logging
-from datetime import datetime
+import types
+import hashlib
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
-import subprocess
+
+# Optional fast JSON parser - falls back to stdlib transparently
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 # ===================== Constants =====================
 # Time constants
@@ -22,6 +43,14 @@ SECONDS_PER_DAY = 86400
 CACHE_EXPIRY_SECONDS = SECONDS_PER_DAY  # 24 hours
 LOG_RETENTION_DAYS = 7
 
+# Nanosecond mirrors of the age thresholds: freshness checks compare
+# time.time_ns() against st_mtime_ns so the per-invocation comparisons
+# stay in pure integer arithmetic (no float boxing)
+NS_PER_SECOND = 1_000_000_000
+ONE_DAY_NS = SECONDS_PER_DAY * NS_PER_SECOND
+CACHE_EXPIRY_NS = CACHE_EXPIRY_SECONDS * NS_PER_SECOND
+LOG_RETENTION_NS = LOG_RETENTION_DAYS * ONE_DAY_NS
+
 # Performance thresholds (for cumulative API time in session)
 # These are higher than single-request thresholds since they're cumulative
 PERF_FAST_MS = 10000       # < 10s cumulative = green (fast session)
@@ -30,30 +59,69 @@ PERF_MODERATE_MS = 60000   # < 60s cumulative = yellow (normal session)
 
 # Trend analysis threshold
 TREND_THRESHOLD = 0.2  # 20% change triggers trend arrow
+# Integer numerator/denominator of (1 ± TREND_THRESHOLD), derived once
+# here so the hot-path ratio comparison stays in int arithmetic while
+# the named constant above remains the single knob
+_TREND_DEN = 100
+_TREND_UP_NUM = round((1 + TREND_THRESHOLD) * _TREND_DEN)
+_TREND_DOWN_NUM = round((1 - TREND_THRESHOLD) * _TREND_DEN)
 
 # Git settings
 GIT_TIMEOUT_SECONDS = 1
 GIT_CACHE_TTL_SECONDS = 5.0  # Cache git status for 5 seconds
+GIT_CACHE_TTL_NS = int(GIT_CACHE_TTL_SECONDS * NS_PER_SECOND)
+GIT_DISK_CACHE_MAX_AGE_SECONDS = 60  # Evict persisted entries older than this
+GIT_DISK_CACHE_MAX_AGE_NS = GIT_DISK_CACHE_MAX_AGE_SECONDS * NS_PER_SECOND
+GIT_CACHE_MAX_ENTRIES = 64  # Bound the per-process cwd cache
+
+# Cache locations (shared by Config and GitStatusChecker); kept as raw
+# strings - the hot paths feed them straight to os.stat/os.open and
+# should not pay PurePath construction
+CACHE_DIR_BASE = os.path.join(os.path.expanduser('~'), '.cache', 'claude-statusline')
+
+# Rendered-line cache: identical stdin + unchanged git state within this
+# window short-circuits the whole pipeline
+RENDER_CACHE_TTL_SECONDS = 2.0
+RENDER_CACHE_TTL_NS = int(RENDER_CACHE_TTL_SECONDS * NS_PER_SECOND)
+RENDER_CACHE_FILE = os.path.join(CACHE_DIR_BASE, 'render.json')
+
+# Configuration defaults (shared by Config and its fallback paths)
+DEFAULT_COST_THRESHOLD = 0.50
+DEFAULT_LOG_LEVEL = 'OFF'
+
+# Set by setup_logging when a handler is actually configured; hot-path
+# log calls are gated on it so disabled runs skip even the f-string
+# argument formatting
+_LOG_ENABLED = False
+
+# Environment facts that cannot change mid-process, read once at import
+_NO_COLOR = 'NO_COLOR' in os.environ
 
 # ===================== Colors =====================
-class Colors:
-    """ANSI color codes for terminal output (eye-friendly palette)"""
+# Both palettes exist as interned module constants; the active one is
+# copied into the Colors namespace at import time
+_COLORS_ON = {
+    'ORANGE': '\033[38;5;173m',   # Model name
+    'CYAN': '\033[38;5;87m',      # Cost/metrics
+    'DIM': '\033[2m',             # Secondary info
+    'GREEN': '\033[38;5;78m',     # Positive/fast
+    'YELLOW': '\033[38;5;185m',   # Warning/moderate
+    'RED': '\033[38;5;167m',      # Alert/slow
+    'RESET': '\033[0m',
+}
+_COLORS_OFF = {name: '' for name in _COLORS_ON}
 
-    _enabled = 'NO_COLOR' not in os.environ
+# Plain namespace instance: attribute reads skip the class descriptor
+# protocol that class attributes pay on every lookup
+Colors = types.SimpleNamespace(**(_COLORS_OFF if _NO_COLOR else _COLORS_ON))
 
-    ORANGE = '\033[38;5;173m' if _enabled else ''   # Model name
-    CYAN = '\033[38;5;87m' if _enabled else ''      # Cost/metrics
-    DIM = '\033[2m' if _enabled else ''             # Secondary info
-    GREEN = '\033[38;5;78m' if _enabled else ''     # Positive/fast
-    YELLOW = '\033[38;5;185m' if _enabled else ''   # Warning/moderate
-    RED = '\033[38;5;167m' if _enabled else ''      # Alert/slow
-    RESET = '\033[0m' if _enabled else ''
 
-    @classmethod
-    def disable(cls):
-        """Disable all colors"""
-        cls.ORANGE = cls.CYAN = cls.DIM = ''
-        cls.GREEN = cls.YELLOW = cls.RED = cls.RESET = ''
+def _disable_colors():
+    """Disable all colors"""
+    Colors.__dict__.update(_COLORS_OFF)
+
+
+Colors.disable = _disable_colors
 
 # ===================== Configuration =====================
 class Config:
@@ -62,28 +130,34 @@ class Config:
     VALID_LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OFF']
 
     def __init__(self):
+        # Bind the environ mapping once; each os.environ.get goes through
+        # the encoding-aware wrapper, so one lookup of the mapping suffices
+        env = os.environ
+
         # Cost Alert Configuration - with error handling
         try:
-            self.cost_threshold = float(os.environ.get('STATUSLINE_COST_THRESHOLD', '0.50'))
+            self.cost_threshold = float(env.get('STATUSLINE_COST_THRESHOLD',
+                                                DEFAULT_COST_THRESHOLD))
             if self.cost_threshold < 0:
-                self.cost_threshold = 0.50
+                self.cost_threshold = DEFAULT_COST_THRESHOLD
         except (ValueError, TypeError):
-            self.cost_threshold = 0.50  # Fallback to default
+            self.cost_threshold = DEFAULT_COST_THRESHOLD  # Fallback to default
 
         # Cache directory for trends
-        self.cache_dir_base = Path.home() / '.cache' / 'claude-statusline'
+        self.cache_dir_base = Path(CACHE_DIR_BASE)
         self.stats_cache_file = self.cache_dir_base / 'session_stats.json'
+        self.cache_dir_created = False  # Set by ensure_directories()
 
-        # Logging - default to WARNING for better performance
-        log_level_str = os.environ.get('STATUSLINE_LOG_LEVEL', 'WARNING').upper()
-        self.log_level = log_level_str if log_level_str in self.VALID_LOG_LEVELS else 'WARNING'
+        # Logging - default to OFF for better performance
+        log_level_str = env.get('STATUSLINE_LOG_LEVEL', DEFAULT_LOG_LEVEL).upper()
+        self.log_level = log_level_str if log_level_str in self.VALID_LOG_LEVELS else DEFAULT_LOG_LEVEL
         self.log_dir = self.cache_dir_base / 'logs'
 
         # Debug Mode
-        self.debug = os.environ.get('STATUSLINE_DEBUG', '0') == '1'
+        self.debug = env.get('STATUSLINE_DEBUG', '0') == '1'
 
         # Color Output - also update Colors class
-        self.no_color = 'NO_COLOR' in os.environ
+        self.no_color = 'NO_COLOR' in env
         if self.no_color:
             Colors.disable()
 
@@ -91,8 +165,14 @@ class Config:
         """Ensure required directories exist (initialization)"""
         success = True
         try:
-            self.cache_dir_base.mkdir(parents=True, exist_ok=True)
+            self.cache_dir_base.mkdir(parents=True)
+            # Fresh directory means no cache files can exist yet -
+            # consumers can skip their first load attempt
+            self.cache_dir_created = True
+        except FileExistsError:
+            self.cache_dir_created = False
         except (OSError, PermissionError) as e:
+            import logging
             logging.warning(f"Cache directory unavailable: {e}")
             success = False
         return success
@@ -108,12 +188,11 @@ class Config:
 # ===================== Logging Setup =====================
 def _should_run_log_cleanup(log_dir: Path) -> bool:
     """Check if log cleanup should run (once per day)"""
-    marker_file = log_dir / '.last_cleanup'
     try:
-        if marker_file.exists():
-            last_cleanup = marker_file.stat().st_mtime
-            if time.time() - last_cleanup < SECONDS_PER_DAY:
-                return False
+        # One stat answers both "does the marker exist" and "how old"
+        last_cleanup = (log_dir / '.last_cleanup').stat().st_mtime_ns
+        if time.time_ns() - last_cleanup < ONE_DAY_NS:
+            return False
     except OSError:
         pass
     return True
@@ -128,90 +207,294 @@ def _mark_cleanup_done(log_dir: Path):
         pass
 
 
+def _make_lazy_file_handler(path: Path, formatter):
+    """Build a handler that defers mkdir and open() until the first record.
+
+    Most runs emit zero records at the configured level, so the log file
+    (and its directory) should not be touched at all on those runs.
+    Defined via a factory so the logging import itself stays off the
+    cached fast path.
+    """
+    import logging
+
+    class LazyFileHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self._real: Optional[logging.Handler] = None
+            self.setFormatter(formatter)
+
+        def emit(self, record):
+            if self._real is None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self._real = logging.FileHandler(path)
+                    self._real.setFormatter(self.formatter)
+                except (OSError, PermissionError):
+                    self._real = logging.NullHandler()
+            self._real.emit(record)
+
+        def close(self):
+            if self._real is not None:
+                self._real.close()
+            super().close()
+
+    return LazyFileHandler()
+
+
 def setup_logging(config: Config):
     """Setup logging system"""
+    import logging
+    global _LOG_ENABLED
+
     if config.log_level == 'OFF':
         logging.disable(logging.CRITICAL)
         return
 
+    # Steady-state code only logs at DEBUG/INFO, so at WARNING and above
+    # there is nothing to write - skip handler setup, mkdir and the
+    # cleanup scan entirely (unless debugging)
+    if config.log_level in ('WARNING', 'ERROR', 'CRITICAL') and not config.debug:
+        logging.disable(logging.WARNING)
+        return
+
     try:
-        config.log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = config.log_dir / f"statusline-{datetime.now().strftime('%Y%m%d')}.log"
-
-        # Configure logging (log_level already validated in Config)
-        logging.basicConfig(
-            level=getattr(logging, config.log_level),
-            format='[%(asctime)s] [%(levelname)s] [%(funcName)s] %(message)s',
-            handlers=[logging.FileHandler(log_file)]
-        )
+        t = time.localtime()
+        log_file = config.log_dir / f"statusline-{t.tm_year}{t.tm_mon:02d}{t.tm_mday:02d}.log"
 
-        # Log rotation - only run once per day for performance
-        if _should_run_log_cleanup(config.log_dir):
-            retention_cutoff = time.time() - (LOG_RETENTION_DAYS * SECONDS_PER_DAY)
-            for old_log in config.log_dir.glob("statusline-*.log*"):
-                try:
-                    if old_log.stat().st_mtime < retention_cutoff:
-                        old_log.unlink()
-                except (OSError, PermissionError):
-                    pass  # Ignore errors deleting old logs
-            _mark_cleanup_done(config.log_dir)
+        # Configure logging (log_level already validated in Config);
+        # mkdir and file open happen lazily on the first emitted record
+        formatter = logging.Formatter(
+            '[%(asctime)s] [%(levelname)s] [%(funcName)s] %(message)s'
+        )
+        logging.root.setLevel(getattr(logging, config.log_level))
+        logging.root.addHandler(_make_lazy_file_handler(log_file, formatter))
+        _LOG_ENABLED = True
 
     except (OSError, PermissionError):
         # If logging setup fails, disable logging but continue
         logging.disable(logging.CRITICAL)
 
+
+def start_log_cleanup(config: Config) -> Optional[threading.Thread]:
+    """Start the daily log cleanup on a background thread.
+
+    Runs off the critical path so the statusline is printed before any
+    directory scanning happens; main joins the returned thread after the
+    output is written. Returns None when no cleanup is due.
+    """
+    try:
+        if not config.log_dir.is_dir() or not _should_run_log_cleanup(config.log_dir):
+            return None
+    except OSError:
+        return None
+
+    def _cleanup():
+        retention_cutoff = time.time_ns() - LOG_RETENTION_NS
+        try:
+            # scandir serves cached stat results from the directory read,
+            # unlike glob + per-entry Path.stat()
+            with os.scandir(config.log_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith('statusline-')
+                            and '.log' in entry.name):
+                        continue
+                    try:
+                        if entry.stat().st_mtime_ns < retention_cutoff:
+                            os.unlink(entry.path)
+                    except (OSError, PermissionError):
+                        pass  # Ignore errors deleting old logs
+        except OSError:
+            return
+        _mark_cleanup_done(config.log_dir)
+
+    thread = threading.Thread(target=_cleanup, daemon=True)
+    thread.start()
+    return thread
+
 # ===================== Git Status Checker =====================
 class GitStatusChecker:
     """Check git repository status with caching for performance"""
 
-    # Cache: {cwd: (is_dirty, timestamp)}
-    _cache: Dict[str, Tuple[bool, float]] = {}
+    # Cache: {cwd: (branch, detached, is_dirty, index_mtime_ns, checked_at_ns)}
+    # Persisted across invocations since the statusline runs as a fresh
+    # process on every prompt refresh
+    _cache: Dict[str, Tuple[str, bool, bool, Optional[int], int]] = {}
+    _disk_cache_file = os.path.join(CACHE_DIR_BASE, 'git_status.json')
+    _disk_cache_loaded = False
 
     @classmethod
-    def check_dirty_status(cls, cwd: str) -> bool:
-        """Check if git repo has uncommitted changes (with caching)"""
-        now = time.time()
+    def probe(cls, cwd: str) -> Tuple[str, bool, bool]:
+        """Get (branch, detached, is_dirty) for cwd with caching.
+
+        Branch and dirty state come from a single git invocation, so the
+        slow path forks exactly once per repo per TTL window.
+        """
+        if not cls._disk_cache_loaded:
+            cls._load_disk_cache()
+        now = time.time_ns()
+        index_mtime = cls._get_index_mtime(cwd)
 
         # Check cache first
         if cwd in cls._cache:
-            is_dirty, cached_at = cls._cache[cwd]
-            if now - cached_at < GIT_CACHE_TTL_SECONDS:
-                return is_dirty
+            branch, detached, is_dirty, cached_mtime, cached_at = cls._cache[cwd]
+            # Unchanged index means unchanged status - skip the subprocess
+            # entirely, regardless of TTL
+            if index_mtime is not None and index_mtime == cached_mtime:
+                return branch, detached, is_dirty
+            if now - cached_at < GIT_CACHE_TTL_NS:
+                return branch, detached, is_dirty
 
         # Cache miss or expired - perform actual check
-        is_dirty = cls._check_dirty_impl(cwd)
-        cls._cache[cwd] = (is_dirty, now)
-        return is_dirty
+        branch, detached, is_dirty = cls._probe_impl(cwd)
+        cls._cache[cwd] = (branch, detached, is_dirty, index_mtime, now)
+
+        # Keep the cache bounded in long-lived embedding processes by
+        # evicting the least recently checked cwd
+        while len(cls._cache) > GIT_CACHE_MAX_ENTRIES:
+            oldest = min(cls._cache, key=lambda k: cls._cache[k][4])
+            del cls._cache[oldest]
+
+        cls._save_disk_cache()
+        return branch, detached, is_dirty
+
+    @classmethod
+    def check_dirty_status(cls, cwd: str) -> bool:
+        """Check if git repo has uncommitted changes (with caching)"""
+        return cls.probe(cwd)[2]
+
+    @classmethod
+    def _load_disk_cache(cls):
+        """Load the persisted cache written by a previous invocation"""
+        cls._disk_cache_loaded = True
+        try:
+            st = os.stat(cls._disk_cache_file)
+        except OSError:
+            return
+        if time.time_ns() - st.st_mtime_ns >= GIT_CACHE_TTL_NS:
+            return
+        try:
+            fd = os.open(cls._disk_cache_file, os.O_RDONLY)
+            try:
+                buf = os.read(fd, st.st_size)
+            finally:
+                os.close(fd)
+            data = _json_loads(buf)
+        except (ValueError, OSError) as e:
+            import logging
+            logging.debug(f"Failed to load git status cache: {e}")
+            return
+        for cwd, entry in data.items():
+            if isinstance(entry, list) and len(entry) == 5:
+                cls._cache.setdefault(cwd, tuple(entry))
+
+    @classmethod
+    def _save_disk_cache(cls):
+        """Persist the cache for the next invocation (atomic rename)"""
+        try:
+            # Derived from _disk_cache_file so overriding that class
+            # attribute (e.g. in tests) redirects the write entirely
+            os.makedirs(os.path.dirname(cls._disk_cache_file), exist_ok=True)
+            cutoff = time.time_ns() - GIT_DISK_CACHE_MAX_AGE_NS
+            data = {cwd: entry for cwd, entry in cls._cache.items()
+                    if entry[4] >= cutoff}
+            temp_file = cls._disk_cache_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(_json_dumps(data))
+            os.replace(temp_file, cls._disk_cache_file)
+        except OSError as e:
+            import logging
+            logging.debug(f"Failed to save git status cache: {e}")
 
     @staticmethod
-    def _check_dirty_impl(cwd: str) -> bool:
-        """Actual git dirty status check implementation"""
+    def _get_index_mtime(cwd: str) -> Optional[int]:
+        """Get mtime (ns) of .git/index, or None if unavailable"""
         try:
-            git_dir = Path(cwd) / '.git'
-            if not git_dir.exists():
-                return False
+            return os.stat(f"{cwd}/.git/index").st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_head(cwd: str) -> Tuple[str, bool]:
+        """Read branch name / detached state straight from .git/HEAD.
+
+        HEAD is <=41 bytes; a raw fd read skips TextIOWrapper setup.
+        Used when git itself cannot be forked, and for the short commit
+        hash in detached HEAD state.
+        """
+        try:
+            fd = os.open(f"{cwd}/.git/HEAD", os.O_RDONLY)
+            try:
+                data = os.read(fd, 128)
+            finally:
+                os.close(fd)
+        except OSError:
+            return '', False
+        if data.startswith(b'ref: refs/heads/'):
+            # Normal branch reference - a fixed-offset slice keeps
+            # slashed names intact ('refs/heads/feature/foo' -> 'feature/foo')
+            return data[16:].strip().decode('utf-8', 'replace'), False
+        data = data.strip()
+        if data:
+            # Detached HEAD - show short commit hash
+            return data[:7].decode('ascii', 'replace'), True
+        return '', False
+
+    @classmethod
+    def _probe_impl(cls, cwd: str) -> Tuple[str, bool, bool]:
+        """Actual git probe: one fork yields both branch and dirty state"""
+        # Imported lazily: on a warm cache we never fork git, so the
+        # subprocess import chain (selectors, signal, ...) is never paid
+        import logging
+        import subprocess
 
-            # Quick check using git status --porcelain
+        try:
+            # One stat of .git/HEAD covers "is this a git repo" - HEAD
+            # always exists in a valid repository. Worktrees (where .git
+            # is a gitdir: pointer file) fail this check and are treated
+            # as non-repos rather than paying a fork to find out.
+            try:
+                os.stat(f"{cwd}/.git/HEAD")
+            except OSError:
+                return '', False, False
+
+            # Branch header and dirty entries from a single invocation
             result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+                ['git', 'status', '--porcelain', '--branch',
+                 '--untracked-files=no', '-z'],
                 cwd=cwd,
                 capture_output=True,
                 text=True,
                 timeout=GIT_TIMEOUT_SECONDS
             )
 
-            # If output is not empty, there are uncommitted changes
-            return bool(result.stdout.strip())
+            records = result.stdout.split('\0')
+            branch, detached = '', False
+            if records and records[0].startswith('## '):
+                header = records[0][3:]
+                if header.startswith('HEAD (no branch)'):
+                    # Detached HEAD - fall back to .git/HEAD for the hash
+                    branch, detached = cls._read_head(cwd)
+                else:
+                    # '## main...origin/main [ahead 1]' or '## main'
+                    branch = header.split('...')[0]
+                    if branch.startswith('No commits yet on '):
+                        branch = branch[len('No commits yet on '):]
+                records = records[1:]
+
+            # Any record beyond the branch header means uncommitted changes
+            is_dirty = any(r.strip() for r in records)
+            return branch, detached, is_dirty
 
         except FileNotFoundError:
             logging.debug("Git command not found")
-            return False
         except subprocess.TimeoutExpired:
             logging.debug("Git status check timed out")
-            return False
         except (OSError, subprocess.SubprocessError) as e:
             logging.debug(f"Failed to check git status: {e}")
-            return False
+
+        # Fork failed - at least report the branch from .git/HEAD
+        branch, detached = cls._read_head(cwd)
+        return branch, detached, False
 
 # ===================== Stats Tracker =====================
 class StatsTracker:
@@ -220,63 +503,100 @@ class StatsTracker:
     def __init__(self, config: Config):
         self.config = config
         self.cache_file = config.stats_cache_file
+        self._prev_missing = False
+
+    def mark_no_previous(self):
+        """Record that no previous stats can exist (fresh cache dir)"""
+        self._prev_missing = True
 
     def _load_previous_stats(self) -> Optional[Dict[str, Any]]:
         """Load previous session stats from cache"""
+        if self._prev_missing:
+            return None
         try:
-            if self.cache_file.exists():
-                cache_age = time.time() - self.cache_file.stat().st_mtime
-                if cache_age < CACHE_EXPIRY_SECONDS:
-                    with open(self.cache_file, 'r') as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                        data = json.load(f)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                        return data
-        except (json.JSONDecodeError, OSError, IOError) as e:
+            st = os.stat(self.cache_file)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            import logging
+            logging.debug(f"Failed to stat previous stats: {e}")
+            return None
+
+        if time.time_ns() - st.st_mtime_ns >= CACHE_EXPIRY_NS:
+            return None
+
+        # Single open+read without BufferedReader setup; the writer's
+        # atomic rename guarantees we never see a partial file
+        try:
+            fd = os.open(self.cache_file, os.O_RDONLY)
+            try:
+                buf = os.read(fd, st.st_size)
+            finally:
+                os.close(fd)
+            return _json_loads(buf)
+        except (ValueError, OSError, IOError) as e:
+            import logging
             logging.debug(f"Failed to load previous stats: {e}")
         return None
 
     def _save_current_stats(self, lines_added: int, lines_removed: int):
         """Save current session stats to cache with file locking"""
         try:
-            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
             data = {
                 'lines_added': lines_added,
                 'lines_removed': lines_removed,
+                # Pre-computed so the next run's trend check skips the add
+                'total': lines_added + lines_removed,
                 'timestamp': time.time()
             }
+            payload = _json_dumps(data)
 
             # Use temp file + atomic rename for safety
+            # Atomic rename makes locking and fsync unnecessary for this
+            # regeneratable cache: readers see either the old or new file
             temp_file = self.cache_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                json.dump(data, f)
-                f.flush()
-                os.fsync(f.fileno())
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-
-            temp_file.rename(self.cache_file)
+            try:
+                with open(temp_file, 'wb') as f:
+                    f.write(payload)
+            except FileNotFoundError:
+                # Cache dir vanished since ensure_directories - recreate
+                # once rather than paying the mkdir syscall on every save
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_file, 'wb') as f:
+                    f.write(payload)
+
+            os.replace(temp_file, self.cache_file)
 
         except (OSError, IOError) as e:
+            import logging
             logging.debug(f"Failed to save stats: {e}")
 
     def calculate_trend(self, current_added: int, current_removed: int) -> str:
         """Calculate trend arrow (pure function, no side effects)"""
         prev = self._load_previous_stats()
+        return self._trend_from_prev(prev, current_added, current_removed)
 
+    @staticmethod
+    def _trend_from_prev(prev: Optional[Dict[str, Any]],
+                         current_added: int, current_removed: int) -> str:
+        """Trend arrow given already-loaded previous stats"""
         if not prev:
             return ' (new)'  # First session indicator
 
         current_total = current_added + current_removed
-        prev_total = prev.get('lines_added', 0) + prev.get('lines_removed', 0)
+        prev_total = prev.get('total')
+        if prev_total is None:
+            # Cache written by an older version without the total field
+            prev_total = prev.get('lines_added', 0) + prev.get('lines_removed', 0)
 
         if prev_total == 0:
             return ' ↗' if current_total > 0 else ''
 
-        ratio = current_total / prev_total
-        if ratio > 1 + TREND_THRESHOLD:
+        # Integer form of ratio > 1 + TREND_THRESHOLD / < 1 - it, using
+        # the derived numerators to avoid float division and boxing
+        if current_total * _TREND_DEN > prev_total * _TREND_UP_NUM:
             return ' ↗'
-        elif ratio < 1 - TREND_THRESHOLD:
+        elif current_total * _TREND_DEN < prev_total * _TREND_DOWN_NUM:
             return ' ↘'
         return ' →'
 
@@ -285,14 +605,28 @@ class StatsTracker:
         self._save_current_stats(lines_added, lines_removed)
 
     def get_trend_and_save(self, current_added: int, current_removed: int) -> str:
-        """Get trend arrow and save stats (combined operation with clear naming)"""
-        trend = self.calculate_trend(current_added, current_removed)
-        self.save_session_stats(current_added, current_removed)
+        """Get trend arrow and save stats (combined operation with clear naming)
+
+        Loads the previous stats once, and skips the rewrite entirely when
+        the counters have not moved - on an idle session the cache file is
+        already byte-identical, so there is nothing to encode or sync.
+        """
+        prev = self._load_previous_stats()
+        trend = self._trend_from_prev(prev, current_added, current_removed)
+        if (prev is not None
+                and prev.get('lines_added') == current_added
+                and prev.get('lines_removed') == current_removed):
+            return trend
+        self._save_current_stats(current_added, current_removed)
         return trend
 
 # ===================== Claude Context Parser =====================
-def parse_claude_context() -> Dict[str, Any]:
-    """Parse Claude Code context from stdin - enhanced with productivity metrics"""
+def parse_claude_context(source: Optional[Any] = None) -> Dict[str, Any]:
+    """Parse Claude Code context - enhanced with productivity metrics.
+
+    source may be the already-read stdin payload (str or bytes); when
+    None the payload is read from stdin directly.
+    """
     result = {
         'model': 'Claude',
         'dir': '.',
@@ -308,87 +642,192 @@ def parse_claude_context() -> Dict[str, Any]:
     }
 
     try:
-        input_data = sys.stdin.read()
+        # Read raw bytes when possible so orjson can skip the UTF-8 decode;
+        # a tty stdin means nothing was piped, so don't block on it
+        if source is not None:
+            input_data = source
+        elif sys.stdin.isatty():
+            input_data = None
+        else:
+            input_data = getattr(sys.stdin, 'buffer', sys.stdin).read()
         if input_data:
-            data = json.loads(input_data)
+            data = _json_loads(input_data)
 
             # Parse model
             if 'model' in data:
                 result['model'] = data['model'].get('display_name') or data['model'].get('id', 'Claude')
 
-            # Parse directory
+            # Parse directory (branch/detached now come from the combined
+            # git probe in main, not from stdin parsing)
             if 'workspace' in data:
                 cwd = data['workspace'].get('current_dir', '.')
                 result['cwd'] = cwd
-                result['dir'] = Path(cwd).name
+                result['dir'] = os.path.basename(cwd.rstrip('/')) or cwd
 
-                # Check for git branch (handle detached HEAD)
-                git_head = Path(cwd) / '.git' / 'HEAD'
-                if git_head.exists():
-                    try:
-                        content = git_head.read_text().strip()
-                        if content.startswith('ref: '):
-                            # Normal branch reference
-                            result['branch'] = content.split('/')[-1]
-                        else:
-                            # Detached HEAD - show short commit hash
-                            result['branch'] = content[:7]
-                            result['detached'] = True
-                    except (OSError, IOError):
-                        pass
-
-            # Parse cost metrics
-            if 'cost' in data:
+            # Parse cost metrics - bind the cost dict to a local once and
+            # pull each field with a single lookup
+            cost = data.get('cost')
+            if cost is not None:
                 # Cost in USD
-                cost_usd = data['cost'].get('total_cost_usd') or data['cost'].get('usd')
+                cost_usd = cost.get('total_cost_usd') or cost.get('usd')
+
+                # Duration (handle both ms and sec formats)
+                duration_ms = cost.get('total_duration_ms')
+                if duration_ms:
+                    duration_seconds = duration_ms / 1000
+                else:
+                    duration_seconds = cost.get('duration_sec')
+
+                lines_added = cost.get('total_lines_added')
+                lines_removed = cost.get('total_lines_removed')
+                api_duration = cost.get('total_api_duration_ms')
+
                 if cost_usd is not None:
                     result['cost_usd'] = float(cost_usd)
                     result['cost_str'] = f"${cost_usd:.3f}"
 
-                # Parse duration (handle both ms and sec formats)
-                duration_value = data['cost'].get('total_duration_ms') or data['cost'].get('duration_sec')
-                if duration_value is not None and duration_value > 0:
-                    # Convert to seconds if value was in milliseconds
-                    if data['cost'].get('total_duration_ms'):
-                        duration_seconds = duration_value / 1000
-                    else:
-                        duration_seconds = duration_value
-
+                if duration_seconds:
                     minutes = int(duration_seconds // 60)
                     if minutes > 0:
                         result['duration'] = f"{minutes}m"
                     else:
-                        seconds = int(duration_seconds)
-                        result['duration'] = f"{seconds}s"
+                        result['duration'] = f"{int(duration_seconds)}s"
 
-                # Parse code change stats
-                lines_added = data['cost'].get('total_lines_added')
                 if lines_added is not None:
                     result['lines_added'] = int(lines_added)
-
-                lines_removed = data['cost'].get('total_lines_removed')
                 if lines_removed is not None:
                     result['lines_removed'] = int(lines_removed)
-
-                # Parse API performance (cumulative time)
-                api_duration = data['cost'].get('total_api_duration_ms')
                 if api_duration is not None:
                     result['api_duration_ms'] = int(api_duration)
 
     except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        import logging
         logging.debug(f"Failed to parse Claude context: {e}")
 
     return result
 
+
+# Cumulative API-time color bands, pre-sorted for the threshold walk in
+# _format_api_duration; the inf sentinel keeps the lookup total
+_API_COLOR_BANDS = ((PERF_FAST_MS, 'GREEN'), (PERF_MODERATE_MS, 'YELLOW'),
+                    (float('inf'), 'RED'))
+
+
+def _format_api_duration(api_duration: int) -> Tuple[str, str]:
+    """Format cumulative API time as (color_code, display string).
+
+    The color is resolved from Colors at call time so NO_COLOR /
+    Colors.disable() keep working.
+    """
+    if api_duration < 1000:
+        api_str = f"{api_duration}ms"
+    elif api_duration < 60000:
+        api_str = f"{api_duration/1000:.1f}s"
+    else:
+        # Show minutes for very long sessions
+        api_str = f"{api_duration/60000:.1f}m"
+
+    for limit, color_name in _API_COLOR_BANDS:
+        if api_duration < limit:
+            return getattr(Colors, color_name), api_str
+    return Colors.RED, api_str  # Unreachable: inf sentinel always matches
+
+# ===================== Render Cache =====================
+def _render_key(raw: bytes) -> str:
+    """Cache key for a raw stdin payload"""
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _git_state_mtimes(cwd: str) -> Tuple[Optional[int], Optional[int]]:
+    """(mtime_ns of .git/HEAD, mtime_ns of .git/index) - None if missing"""
+    mtimes = []
+    for name in ('HEAD', 'index'):
+        try:
+            mtimes.append(os.stat(f"{cwd}/.git/{name}").st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes[0], mtimes[1]
+
+
+def load_cached_render(raw: bytes) -> Optional[str]:
+    """Return the previously rendered line if still valid, else None.
+
+    Valid means: same stdin payload, same .git/HEAD and .git/index
+    mtimes for the cached cwd, and younger than RENDER_CACHE_TTL_SECONDS.
+    """
+    try:
+        st = os.stat(RENDER_CACHE_FILE)
+        if time.time_ns() - st.st_mtime_ns >= RENDER_CACHE_TTL_NS:
+            return None
+        fd = os.open(RENDER_CACHE_FILE, os.O_RDONLY)
+        try:
+            buf = os.read(fd, st.st_size)
+        finally:
+            os.close(fd)
+        entry = _json_loads(buf)
+    except (ValueError, OSError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get('key') != _render_key(raw):
+        return None
+    head_mtime, index_mtime = _git_state_mtimes(entry.get('cwd', '.'))
+    if head_mtime != entry.get('head_mtime') or index_mtime != entry.get('index_mtime'):
+        return None
+    line = entry.get('line')
+    return line if isinstance(line, str) else None
+
+
+def save_cached_render(raw: bytes, cwd: str, line: str):
+    """Persist the rendered line for the next invocation (atomic rename)"""
+    try:
+        os.makedirs(CACHE_DIR_BASE, exist_ok=True)
+        head_mtime, index_mtime = _git_state_mtimes(cwd)
+        entry = {
+            'key': _render_key(raw),
+            'cwd': cwd,
+            'head_mtime': head_mtime,
+            'index_mtime': index_mtime,
+            'line': line,
+        }
+        temp_file = RENDER_CACHE_FILE + '.tmp'
+        with open(temp_file, 'wb') as f:
+            f.write(_json_dumps(entry))
+        os.replace(temp_file, RENDER_CACHE_FILE)
+    except OSError as e:
+        import logging
+        logging.debug(f"Failed to save render cache: {e}")
+
 # ===================== Main Function =====================
 def main():
     """Main entry point - Productivity-focused statusline"""
+    # Fast path: identical stdin + unchanged git state within the TTL
+    # replays the previous line before any config/logging/git work.
+    # A tty stdin (manual invocation) means no context was piped - skip
+    # the blocking read instead of waiting on the terminal
+    if sys.stdin.isatty():
+        raw_input = b''
+    else:
+        raw_input = getattr(sys.stdin, 'buffer', sys.stdin).read()
+    cached_line = load_cached_render(raw_input)
+    if cached_line is not None:
+        sys.stdout.buffer.write((cached_line + '\n').encode('utf-8', 'replace'))
+        sys.stdout.buffer.flush()
+        return
+
+    # Slow path from here on - logging (and everything else) is fair game
+    import logging
+
     # Initialize configuration
     config = Config()
 
-    # Setup logging
+    # Setup logging; the daily cleanup scan runs in the background and
+    # is joined only after the statusline has been printed
     setup_logging(config)
-    logging.info("Productivity StatusLine started")
+    cleanup_thread = start_log_cleanup(config)
+    if _LOG_ENABLED:
+        logging.info("Productivity StatusLine started")
 
     # Ensure directories exist and validate config
     config.ensure_directories()
@@ -396,95 +835,113 @@ def main():
         print("ERROR: Configuration invalid")
         sys.exit(1)
 
-    # Parse Claude context
-    context = parse_claude_context()
-    logging.debug(f"Context: {context}")
-
-    # Check git dirty status
-    is_dirty = GitStatusChecker.check_dirty_status(context['cwd'])
-
-    # Get code change trend (using renamed method with clear semantics)
+    # Parse Claude context from the payload read above
+    context = parse_claude_context(raw_input)
+    if _LOG_ENABLED:
+        logging.debug(f"Context: {context}")
+
+    # Kick off the git probe in the background: a cache-miss fork takes
+    # 10-50ms and is independent of the stats-cache disk I/O below
+    probe_result = []
+    probe_thread = threading.Thread(
+        target=lambda: probe_result.append(GitStatusChecker.probe(context['cwd'])),
+        daemon=True
+    )
+    probe_thread.start()
+
+    # Get code change trend (using renamed method with clear semantics);
+    # a freshly created cache dir means the load would be a guaranteed miss
     tracker = StatsTracker(config)
+    if config.cache_dir_created:
+        tracker.mark_no_previous()
     trend_arrow = tracker.get_trend_and_save(context['lines_added'], context['lines_removed'])
 
-    # Build header with current time
-    current_time = datetime.now().strftime('%H:%M')
-    header = f"⏰ {current_time}"
+    # Collect the probe result right before it is needed
+    probe_thread.join(timeout=GIT_TIMEOUT_SECONDS + 1)
+    branch, detached, is_dirty = probe_result[0] if probe_result else ('', False, False)
+
+    # Capture color codes as locals once - main reads them ~20 times and
+    # each Colors.X access is a class attribute lookup
+    ORANGE, CYAN, DIM = Colors.ORANGE, Colors.CYAN, Colors.DIM
+    GREEN, RED, RESET = Colors.GREEN, Colors.RED, Colors.RESET
+
+    # Build the whole line as a parts list joined once at the end
+    # (time.localtime + f-string is much cheaper than strftime here)
+    t = time.localtime()
+    parts = [f"⏰ {t.tm_hour:02d}:{t.tm_min:02d}"]
 
     # Add model info
-    header += f" | {Colors.ORANGE}{context['model']}{Colors.RESET}"
+    parts.append(f" | {ORANGE}{context['model']}{RESET}")
 
     # Add directory and branch with dirty indicator
-    header += f" {Colors.DIM}{context['dir']}{Colors.RESET}"
-    if context['branch']:
-        if context.get('detached'):
+    parts.append(f" {DIM}{context['dir']}{RESET}")
+    if branch:
+        if detached:
             # Detached HEAD - show with @ prefix
-            header += f":{Colors.DIM}@{context['branch']}{Colors.RESET}"
+            parts.append(f":{DIM}@{branch}{RESET}")
         else:
-            header += f":{context['branch']}"
+            parts.append(f":{branch}")
         if is_dirty:
-            header += f"{Colors.RED}●{Colors.RESET}"  # Enhanced dirty indicator
+            parts.append(f"{RED}●{RESET}")  # Enhanced dirty indicator
 
     # Add cost metrics with alert if threshold exceeded
     metrics = []
     if context.get('cost_str'):
-        cost_display = context['cost_str']
         if context['cost_usd'] > config.cost_threshold:
-            cost_display += f" {Colors.RED}⚠️{Colors.RESET}"
-        metrics.append(f"{Colors.CYAN}{cost_display}{Colors.RESET}")
+            metrics.append(f"{CYAN}{context['cost_str']} {RED}⚠️{RESET}")
+        else:
+            metrics.append(f"{CYAN}{context['cost_str']}{RESET}")
 
     if context.get('duration'):
-        metrics.append(f"{Colors.CYAN}{context['duration']}{Colors.RESET}")
+        metrics.append(f"{CYAN}{context['duration']}{RESET}")
 
     if metrics:
-        header += f" [{' '.join(metrics)}]"
-
-    # Build productivity metrics part
-    productivity_parts = []
+        parts.append(f" [{' '.join(metrics)}]")
 
     # Code change statistics
     lines_added = context['lines_added']
     lines_removed = context['lines_removed']
     if lines_added > 0 or lines_removed > 0:
-        code_stats = f"{Colors.GREEN}📝 +{lines_added}/-{lines_removed}{trend_arrow}{Colors.RESET}"
-        productivity_parts.append(code_stats)
+        parts.append(f" | {GREEN}📝 +{lines_added}/-{lines_removed}{trend_arrow}{RESET}")
     else:
         # Simplified "no changes" display
-        productivity_parts.append(f"{Colors.DIM}📝 0/0{trend_arrow}{Colors.RESET}")
+        parts.append(f" | {DIM}📝 0/0{trend_arrow}{RESET}")
 
     # API performance indicator (using cumulative thresholds)
     api_duration = context['api_duration_ms']
     if api_duration > 0:
-        # Format API duration nicely
-        if api_duration < 1000:
-            api_str = f"{api_duration}ms"
-        elif api_duration < 60000:
-            api_str = f"{api_duration/1000:.1f}s"
-        else:
-            # Show minutes for very long sessions
-            api_str = f"{api_duration/60000:.1f}m"
-
-        # Color based on cumulative performance thresholds
-        if api_duration < PERF_FAST_MS:
-            perf_display = f"{Colors.GREEN}⚡{api_str}{Colors.RESET}"
-        elif api_duration < PERF_MODERATE_MS:
-            perf_display = f"{Colors.YELLOW}⚡{api_str}{Colors.RESET}"
-        else:
-            perf_display = f"{Colors.RED}⚡{api_str}{Colors.RESET}"
+        perf_color, api_str = _format_api_duration(api_duration)
+        parts.append(f" | {perf_color}⚡{api_str}{RESET}")
+
+    output = ''.join(parts)
+
+    # Output (first line only, as per official docs) - one coalesced
+    # write skips print()'s TextIOWrapper locking and newline
+    # translation; utf-8 because the line carries emoji/arrows
+    buf = (output + '\n').encode('utf-8', 'replace')
+    if config.debug:
+        sys.stdout.buffer.write(buf)
+        sys.stdout.buffer.flush()
+    else:
+        os.write(1, buf)
 
-        productivity_parts.append(perf_display)
+    # Remember this render so an identical refresh can replay it
+    save_cached_render(raw_input, context['cwd'], output)
 
-    # Combine all parts
-    if productivity_parts:
-        output = f"{header} | {' | '.join(productivity_parts)}"
-    else:
-        output = f"{header} | {Colors.DIM}Initializing...{Colors.RESET}"
+    if _LOG_ENABLED:
+        logging.info(f"Productivity status displayed: +{lines_added}/-{lines_removed}, API: {api_duration}ms")
+        logging.info("Execution completed")
 
-    # Output (first line only, as per official docs)
-    print(output)
+    # Let the background log cleanup finish (daemon threads would be
+    # killed at interpreter exit otherwise)
+    if cleanup_thread is not None:
+        cleanup_thread.join()
 
-    logging.info(f"Productivity status displayed: +{lines_added}/-{lines_removed}, API: {api_duration}ms")
-    logging.info("Execution completed")
+    # Skip interpreter teardown (GC, atexit, logging shutdown) - the
+    # output is already on the wire and log records are flushed per
+    # emit. Debug mode keeps the normal exit path.
+    if not config.debug:
+        os._exit(0)
 
 
 if __name__ == "__main__":
@@ -493,6 +950,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         sys.exit(0)
     except Exception as e:
+        import logging
         logging.error(f"Unhandled exception: {e}", exc_info=True)
         print(f"ERROR: {e}")
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1 @@
+statusline-hz.py
\ No newline at end of file
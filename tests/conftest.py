@@ -0,0 +1,40 @@
+"""Shared test setup: load statusline-hz.py exactly once per session.
+
+The script's hyphenated filename keeps it off the regular import path,
+so it is loaded via importlib and registered in sys.modules under
+'statusline'. Registering it there means the test module (and any future
+test files) reuse the already-executed module instead of re-running the
+importlib dance per file.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+
+def load_statusline():
+    """Return the statusline module, executing it only on first call"""
+    module = sys.modules.get('statusline')
+    if module is not None:
+        return module
+    root = Path(__file__).parent.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    try:
+        # Regular import via the statusline.py symlink: goes through the
+        # import system, so repeated runs load cached bytecode from
+        # __pycache__ instead of re-parsing the source
+        import statusline
+        return statusline
+    except ImportError:
+        pass
+    # Fallback for checkouts without symlink support
+    path = root / 'statusline-hz.py'
+    spec = importlib.util.spec_from_file_location('statusline', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['statusline'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+load_statusline()
@@ -8,18 +8,18 @@ import json
 import os
 import sys
 import tempfile
-from io import StringIO
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Import module by executing it (since it has a hyphen in the name)
-import importlib.util
-spec = importlib.util.spec_from_file_location("statusline", Path(__file__).parent.parent / "statusline-hz.py")
-statusline = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(statusline)
+# Reuse the module loaded by conftest.py under pytest; fall back to the
+# same single-load helper when run directly via unittest
+sys.path.insert(0, str(Path(__file__).parent))
+from conftest import load_statusline
+
+statusline = load_statusline()
 
 
 class TestConstants(unittest.TestCase):
@@ -42,80 +42,92 @@ class TestConstants(unittest.TestCase):
         self.assertEqual(statusline.GIT_CACHE_TTL_SECONDS, 5.0)
 
 
+# All color attributes the statusline renders with
+_COLOR_NAMES = ('ORANGE', 'CYAN', 'DIM', 'GREEN', 'YELLOW', 'RED', 'RESET')
+
+
 class TestColors(unittest.TestCase):
     """Test Colors class functionality"""
 
     def test_colors_defined(self):
         """Verify all color codes are defined"""
-        self.assertIsNotNone(statusline.Colors.ORANGE)
-        self.assertIsNotNone(statusline.Colors.CYAN)
-        self.assertIsNotNone(statusline.Colors.DIM)
-        self.assertIsNotNone(statusline.Colors.GREEN)
-        self.assertIsNotNone(statusline.Colors.YELLOW)
-        self.assertIsNotNone(statusline.Colors.RED)
-        self.assertIsNotNone(statusline.Colors.RESET)
+        missing = [name for name in _COLOR_NAMES
+                   if getattr(statusline.Colors, name, None) is None]
+        self.assertEqual(missing, [])
 
     def test_disable_colors(self):
         """Test that disable() clears all colors"""
-        # Save original values
-        original_orange = statusline.Colors.ORANGE
-
-        statusline.Colors.disable()
-
-        self.assertEqual(statusline.Colors.ORANGE, '')
-        self.assertEqual(statusline.Colors.RESET, '')
-
-        # Restore (for other tests)
-        statusline.Colors.ORANGE = original_orange
+        # Snapshot every color attribute so the restore is complete -
+        # restoring only ORANGE would leak empty strings into any test
+        # that runs after this one
+        snapshot = {name: getattr(statusline.Colors, name)
+                    for name in _COLOR_NAMES}
+        try:
+            statusline.Colors.disable()
+
+            still_set = [name for name in _COLOR_NAMES
+                         if getattr(statusline.Colors, name) != '']
+            self.assertEqual(still_set, [])
+        finally:
+            for name, value in snapshot.items():
+                setattr(statusline.Colors, name, value)
 
 
 class TestConfig(unittest.TestCase):
     """Test Config class"""
 
-    def test_default_values(self):
-        """Test default configuration values"""
-        with patch.dict(os.environ, {}, clear=True):
-            config = statusline.Config()
-            self.assertEqual(config.cost_threshold, 0.50)
-            self.assertEqual(config.log_level, 'WARNING')
-            self.assertFalse(config.debug)
-
-    def test_custom_cost_threshold(self):
-        """Test custom cost threshold from environment"""
-        with patch.dict(os.environ, {'STATUSLINE_COST_THRESHOLD': '1.25'}):
-            config = statusline.Config()
-            self.assertEqual(config.cost_threshold, 1.25)
-
-    def test_invalid_cost_threshold_fallback(self):
-        """Test fallback for invalid cost threshold"""
-        with patch.dict(os.environ, {'STATUSLINE_COST_THRESHOLD': 'invalid'}):
-            config = statusline.Config()
-            self.assertEqual(config.cost_threshold, 0.50)
-
-    def test_negative_cost_threshold_fallback(self):
-        """Test fallback for negative cost threshold"""
-        with patch.dict(os.environ, {'STATUSLINE_COST_THRESHOLD': '-5'}):
-            config = statusline.Config()
-            self.assertEqual(config.cost_threshold, 0.50)
-
-    def test_valid_log_levels(self):
-        """Test valid log level configuration"""
-        for level in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OFF']:
-            with patch.dict(os.environ, {'STATUSLINE_LOG_LEVEL': level}):
+    # Every env key Config reads - cleared between cases for isolation
+    ENV_KEYS = ('STATUSLINE_COST_THRESHOLD', 'STATUSLINE_LOG_LEVEL',
+                'STATUSLINE_DEBUG', 'NO_COLOR')
+
+    # (env overrides, attribute, expected) - one table instead of seven
+    # near-identical methods, so a full run builds Config once per case
+    # with a single shared body
+    ENV_CASES = [
+        # Defaults
+        ({}, 'cost_threshold', 0.50),
+        ({}, 'log_level', 'OFF'),
+        ({}, 'debug', False),
+        # Cost threshold: custom, invalid and negative fallbacks
+        ({'STATUSLINE_COST_THRESHOLD': '1.25'}, 'cost_threshold', 1.25),
+        ({'STATUSLINE_COST_THRESHOLD': 'invalid'}, 'cost_threshold', 0.50),
+        ({'STATUSLINE_COST_THRESHOLD': '-5'}, 'cost_threshold', 0.50),
+        # Log level: invalid fallback
+        ({'STATUSLINE_LOG_LEVEL': 'INVALID'}, 'log_level', 'OFF'),
+        # Debug mode
+        ({'STATUSLINE_DEBUG': '1'}, 'debug', True),
+    ] + [
+        # Every valid log level round-trips
+        ({'STATUSLINE_LOG_LEVEL': level}, 'log_level', level)
+        for level in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OFF')
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        """Snapshot the environment once for the whole class.
+
+        patch.dict copies and restores the full environ mapping per use;
+        mutating only the keys Config reads and restoring from one
+        snapshot in tearDownClass does the same job in O(keys).
+        """
+        cls._env_snapshot = {k: os.environ[k] for k in cls.ENV_KEYS
+                             if k in os.environ}
+
+    @classmethod
+    def tearDownClass(cls):
+        for key in cls.ENV_KEYS:
+            os.environ.pop(key, None)
+        os.environ.update(cls._env_snapshot)
+
+    def test_env_configuration(self):
+        """Table-driven environment variable configuration cases"""
+        for env, attr, expected in self.ENV_CASES:
+            with self.subTest(env=env, attr=attr):
+                for key in self.ENV_KEYS:
+                    os.environ.pop(key, None)
+                os.environ.update(env)
                 config = statusline.Config()
-                self.assertEqual(config.log_level, level)
-
-    def test_invalid_log_level_fallback(self):
-        """Test fallback for invalid log level"""
-        with patch.dict(os.environ, {'STATUSLINE_LOG_LEVEL': 'INVALID'}):
-            config = statusline.Config()
-            self.assertEqual(config.log_level, 'WARNING')
-
-    def test_debug_mode(self):
-        """Test debug mode configuration"""
-        with patch.dict(os.environ, {'STATUSLINE_DEBUG': '1'}):
-            config = statusline.Config()
-            self.assertTrue(config.debug)
+                self.assertEqual(getattr(config, attr), expected)
 
     def test_is_valid(self):
         """Test configuration validation"""
@@ -123,25 +135,29 @@ class TestConfig(unittest.TestCase):
         self.assertTrue(config.is_valid())
 
 
+# JSON fixtures encoded once at module scope rather than per test run
+_VALID_CTX_JSON = json.dumps({
+    'model': {'display_name': 'Sonnet 4.5'},
+    'workspace': {'current_dir': '/test/path'},
+    'cost': {
+        'total_cost_usd': 0.125,
+        'total_duration_ms': 300000,
+        'total_lines_added': 100,
+        'total_lines_removed': 50,
+        'total_api_duration_ms': 5000
+    }
+})
+_DURATION_CTX_JSON = json.dumps({
+    'cost': {'total_duration_ms': 45000}  # 45 seconds
+})
+
+
 class TestParseClaudeContext(unittest.TestCase):
     """Test parse_claude_context function"""
 
     def test_parse_valid_json(self):
         """Test parsing valid Claude context JSON"""
-        mock_input = json.dumps({
-            'model': {'display_name': 'Sonnet 4.5'},
-            'workspace': {'current_dir': '/test/path'},
-            'cost': {
-                'total_cost_usd': 0.125,
-                'total_duration_ms': 300000,
-                'total_lines_added': 100,
-                'total_lines_removed': 50,
-                'total_api_duration_ms': 5000
-            }
-        })
-
-        with patch('sys.stdin', StringIO(mock_input)):
-            result = statusline.parse_claude_context()
+        result = statusline.parse_claude_context(_VALID_CTX_JSON)
 
         self.assertEqual(result['model'], 'Sonnet 4.5')
         self.assertEqual(result['lines_added'], 100)
@@ -152,27 +168,20 @@ class TestParseClaudeContext(unittest.TestCase):
 
     def test_parse_empty_input(self):
         """Test parsing empty input"""
-        with patch('sys.stdin', StringIO('')):
-            result = statusline.parse_claude_context()
+        result = statusline.parse_claude_context('')
 
         self.assertEqual(result['model'], 'Claude')
         self.assertEqual(result['lines_added'], 0)
 
     def test_parse_invalid_json(self):
         """Test parsing invalid JSON gracefully"""
-        with patch('sys.stdin', StringIO('not valid json')):
-            result = statusline.parse_claude_context()
+        result = statusline.parse_claude_context('not valid json')
 
         self.assertEqual(result['model'], 'Claude')
 
     def test_duration_under_one_minute(self):
         """Test duration formatting for sessions under 1 minute"""
-        mock_input = json.dumps({
-            'cost': {'total_duration_ms': 45000}  # 45 seconds
-        })
-
-        with patch('sys.stdin', StringIO(mock_input)):
-            result = statusline.parse_claude_context()
+        result = statusline.parse_claude_context(_DURATION_CTX_JSON)
 
         self.assertEqual(result['duration'], '45s')
 
@@ -180,75 +189,97 @@ class TestParseClaudeContext(unittest.TestCase):
 class TestStatsTracker(unittest.TestCase):
     """Test StatsTracker class"""
 
-    def setUp(self):
-        """Create temporary directory for cache"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = MagicMock()
-        self.config.stats_cache_file = Path(self.temp_dir) / 'session_stats.json'
-        self.tracker = statusline.StatsTracker(self.config)
-
-    def tearDown(self):
-        """Clean up temporary directory"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_first_session_indicator(self):
-        """Test that first session shows (new) indicator"""
-        trend = self.tracker.calculate_trend(100, 50)
-        self.assertEqual(trend, ' (new)')
-
-    def test_trend_increase(self):
-        """Test trend arrow for increased activity"""
-        # Save first session
-        self.tracker.save_session_stats(100, 50)
-
-        # Second session with more changes (>20% increase)
-        trend = self.tracker.calculate_trend(200, 100)
-        self.assertEqual(trend, ' ↗')
-
-    def test_trend_decrease(self):
-        """Test trend arrow for decreased activity"""
-        # Save first session with high activity
-        self.tracker.save_session_stats(200, 100)
+    @classmethod
+    def setUpClass(cls):
+        """One tempdir and one mock config for the whole class"""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        # MagicMock construction is surprisingly costly (child-attribute
+        # bookkeeping); build one template and reset it between tests.
+        # No spec= here: stats_cache_file is an instance attribute, which
+        # spec introspection of the Config class would reject
+        cls._config_template = MagicMock()
 
-        # Second session with fewer changes (>20% decrease)
-        trend = self.tracker.calculate_trend(50, 25)
-        self.assertEqual(trend, ' ↘')
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
 
-    def test_trend_similar(self):
-        """Test trend arrow for similar activity"""
-        # Save first session
-        self.tracker.save_session_stats(100, 50)
+    def setUp(self):
+        """Point each test at its own cache file in the shared tempdir"""
+        self.config = self._config_template
+        self.config.reset_mock()
+        self.config.stats_cache_file = (
+            Path(self._temp_dir.name) / f'{self._testMethodName}.json')
+        self.tracker = statusline.StatsTracker(self.config)
 
-        # Second session with similar changes (within 20%)
-        trend = self.tracker.calculate_trend(110, 55)
-        self.assertEqual(trend, ' →')
+    # (previous session to save, current added/removed, expected arrow):
+    # first session shows (new), then >20% increase, >20% decrease, and
+    # within-20% similar - one tracker walks the whole sequence
+    TREND_CASES = [
+        (None, 100, 50, ' (new)'),
+        ((100, 50), 200, 100, ' ↗'),
+        ((200, 100), 50, 25, ' ↘'),
+        ((100, 50), 110, 55, ' →'),
+    ]
+
+    def test_trend_sequence(self):
+        """Data-driven trend cases sharing one tracker and cache file"""
+        for prev, added, removed, expected in self.TREND_CASES:
+            with self.subTest(prev=prev, added=added, removed=removed):
+                if prev is not None:
+                    self.tracker.save_session_stats(*prev)
+                trend = self.tracker.calculate_trend(added, removed)
+                self.assertEqual(trend, expected)
 
 
 class TestGitStatusChecker(unittest.TestCase):
     """Test GitStatusChecker class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """One non-git tempdir shared by both tests.
+
+        The checker persists its cache under the real
+        ~/.cache/claude-statusline/ between invocations; point it at the
+        tempdir for the duration of the class so the suite neither reads
+        a live cache file nor overwrites it with temp-dir entries.
+        """
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        checker = statusline.GitStatusChecker
+        cls._orig_disk_cache_file = checker._disk_cache_file
+        cls._orig_disk_cache_loaded = checker._disk_cache_loaded
+        checker._disk_cache_file = os.path.join(
+            cls._temp_dir.name, 'git_status.json')
+        checker._disk_cache_loaded = False
+        checker._cache.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        checker = statusline.GitStatusChecker
+        checker._disk_cache_file = cls._orig_disk_cache_file
+        checker._disk_cache_loaded = cls._orig_disk_cache_loaded
+        checker._cache.clear()
+        cls._temp_dir.cleanup()
+
     def test_non_git_directory(self):
         """Test behavior in non-git directory"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = statusline.GitStatusChecker.check_dirty_status(temp_dir)
-            self.assertFalse(result)
+        result = statusline.GitStatusChecker.check_dirty_status(self._temp_dir.name)
+        self.assertFalse(result)
 
     def test_cache_behavior(self):
         """Test that git status is cached"""
-        # Clear cache
+        # Clear cache (only this test depends on cache state)
         statusline.GitStatusChecker._cache.clear()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # First call
-            result1 = statusline.GitStatusChecker.check_dirty_status(temp_dir)
+        temp_dir = self._temp_dir.name
+        # First call
+        result1 = statusline.GitStatusChecker.check_dirty_status(temp_dir)
 
-            # Second call should use cache
-            result2 = statusline.GitStatusChecker.check_dirty_status(temp_dir)
+        # Second call should use cache
+        result2 = statusline.GitStatusChecker.check_dirty_status(temp_dir)
 
-            self.assertEqual(result1, result2)
-            # Verify cache was used
-            self.assertIn(temp_dir, statusline.GitStatusChecker._cache)
+        self.assertEqual(result1, result2)
+        # Verify cache was used
+        self.assertIn(temp_dir, statusline.GitStatusChecker._cache)
 
 
 class TestLoggingSetup(unittest.TestCase):